@@ -1,20 +1,20 @@
 from elegy import types
 import typing as tp
 
+import jax
 import jax.numpy as jnp
 
-from elegy import utils
 from elegy.losses.loss import Loss, Reduction
 
 
 def mean_squared_logarithmic_error(
-    y_true: jnp.ndarray, y_pred: jnp.ndarray
+    y_true: jnp.ndarray, y_pred: jnp.ndarray, clip: bool = True
 ) -> jnp.ndarray:
     """
     Computes the mean squared logarithmic error between labels and predictions.
 
     ```python
-    loss = mean(square(log(y_true + 1) - log(y_pred + 1)), axis=-1)
+    loss = mean(square(log1p(y_true) - log1p(y_pred)), axis=-1)
     ```
 
     Usage:
@@ -29,31 +29,47 @@ def mean_squared_logarithmic_error(
 
     assert loss.shape == (2,)
 
-    first_log = jnp.log(jnp.maximum(y_true, utils.EPSILON) + 1.0)
-    second_log = jnp.log(jnp.maximum(y_pred, utils.EPSILON) + 1.0)
+    first_log = jnp.log1p(jnp.maximum(y_true, 0.0))
+    second_log = jnp.log1p(jnp.maximum(y_pred, 0.0))
     assert jnp.array_equal(loss, jnp.mean(jnp.square(first_log - second_log), axis=-1))
     ```
 
     Arguments:
         y_true: Ground truth values. shape = `[batch_size, d0, .. dN]`.
         y_pred: The predicted values. shape = `[batch_size, d0, .. dN]`.
+        clip: Whether to clip negative values of `y_true` and `y_pred` to `0`
+            before taking the logarithm. Can be set to `False` if both are known
+            to be non-negative, e.g. probabilities.
 
     Returns:
         Mean squared logarithmic error values. shape = `[batch_size, d0, .. dN-1]`.
+            Inputs with less than 32 bits of precision are reduced in `float32`.
     """
 
-    y_true = y_true.astype(y_pred.dtype)
-    first_log = jnp.log(jnp.maximum(y_true, utils.EPSILON) + 1.0)
-    second_log = jnp.log(jnp.maximum(y_pred, utils.EPSILON) + 1.0)
+    if y_true.dtype != y_pred.dtype:
+        y_true = y_true.astype(y_pred.dtype)
 
-    return jnp.mean(jnp.square(first_log - second_log), axis=-1)
+    if clip:
+        y_true = jnp.maximum(y_true, 0.0)
+        y_pred = jnp.maximum(y_pred, 0.0)
+
+    first_log = jnp.log1p(y_true)
+    second_log = jnp.log1p(y_pred)
+    error = first_log - second_log
+    squared_error = error * error
+
+    # low precision inputs (e.g. bfloat16) are only upcasted for the reduction
+    if jnp.finfo(squared_error.dtype).bits < 32:
+        squared_error = squared_error.astype(jnp.float32)
+
+    return jnp.mean(squared_error, axis=-1)
 
 
 class MeanSquaredLogarithmicError(Loss):
     """
     Computes the mean squared logarithmic errors between labels and predictions.
 
-    `loss = mean(square(log(y_true + 1) - log(y_pred + 1)), axis=-1)`
+    `loss = mean(square(log1p(y_true) - log1p(y_pred)), axis=-1)`
 
     Usage:
 
@@ -64,20 +80,20 @@ class MeanSquaredLogarithmicError(Loss):
     # Using 'auto'/'sum_over_batch_size' reduction type.
     msle = elegy.losses.MeanSquaredLogarithmicError()
 
-    assert msle(y_true, y_pred) == 0.24022643
+    assert msle(y_true, y_pred) == 0.2402265
 
     # Calling with 'sample_weight'.
-    assert msle(y_true, y_pred, sample_weight=jnp.array([0.7, 0.3])) = 0.12011322
+    assert msle(y_true, y_pred, sample_weight=jnp.array([0.7, 0.3])) = 0.12011325
 
     # Using 'sum' reduction type.
     msle = elegy.losses.MeanSquaredLogarithmicError(reduction=elegy.losses.Reduction.SUM)
 
-    assert msle(y_true, y_pred) == 0.48045287
+    assert msle(y_true, y_pred) == 0.480453
 
     # Using 'none' reduction type.
     msle = elegy.losses.MeanSquaredLogarithmicError(reduction=elegy.losses.Reduction.NONE)
 
-    assert jnp.equal(msle(y_true, y_pred), jnp.array([0.24022643, 0.24022643])).all()
+    assert jnp.equal(msle(y_true, y_pred), jnp.array([0.2402265, 0.2402265])).all()
     ```
     Usage with the Elegy API:
 
@@ -92,6 +108,7 @@ class MeanSquaredLogarithmicError(Loss):
 
     def __init__(
         self,
+        clip: bool = True,
         reduction: tp.Optional[Reduction] = None,
         weight: tp.Optional[float] = None,
         on: tp.Optional[types.IndexLike] = None,
@@ -101,6 +118,9 @@ class MeanSquaredLogarithmicError(Loss):
         Initializes `Mean` class.
 
         Arguments:
+            clip: Whether to clip negative values of `y_true` and `y_pred` to `0`
+                before taking the logarithm. Can be set to `False` if both are known
+                to be non-negative, e.g. probabilities.
             reduction: (Optional) Type of `elegy.losses.Reduction` to apply to
                 loss. Default value is `SUM_OVER_BATCH_SIZE`. For almost all cases
                 this defaults to `SUM_OVER_BATCH_SIZE`.
@@ -114,7 +134,12 @@ class MeanSquaredLogarithmicError(Loss):
                 check out [Keras-like behavior](https://poets-ai.github.io/elegy/guides/modules-losses-metrics/#keras-like-behavior).
         """
 
-        return super().__init__(reduction=reduction, weight=weight, on=on, **kwargs)
+        super().__init__(reduction=reduction, weight=weight, on=on, **kwargs)
+        self._clip = clip
+
+    def _jit_functions(self):
+        super()._jit_functions()
+        self._jit_fn = jax.jit(mean_squared_logarithmic_error, static_argnums=2)
 
     def call(
         self,
@@ -150,4 +175,4 @@ class MeanSquaredLogarithmicError(Loss):
         Raises:
             ValueError: If the shape of `sample_weight` is invalid.
         """
-        return mean_squared_logarithmic_error(y_true, y_pred)
+        return self._jit_fn(y_true, y_pred, self._clip)
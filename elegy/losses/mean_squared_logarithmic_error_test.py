@@ -1,7 +1,6 @@
 import elegy
 
 
-from elegy import utils
 import jax.numpy as jnp
 import jax
 import tensorflow.keras as tfk
@@ -21,24 +20,26 @@ def test_basic():
     # Using 'auto'/'sum_over_batch_size' reduction type.
     msle = elegy.losses.MeanSquaredLogarithmicError()
 
-    assert msle(y_true, y_pred) == 0.24022643
+    assert jnp.isclose(msle(y_true, y_pred), 0.2402265)
 
     # Calling with 'sample_weight'.
-    assert msle(y_true, y_pred, sample_weight=jnp.array([0.7, 0.3])) == 0.12011322
+    assert jnp.isclose(
+        msle(y_true, y_pred, sample_weight=jnp.array([0.7, 0.3])), 0.12011325
+    )
 
     # Using 'sum' reduction type.
     msle = elegy.losses.MeanSquaredLogarithmicError(
         reduction=elegy.losses.Reduction.SUM
     )
 
-    assert msle(y_true, y_pred) == 0.48045287
+    assert jnp.isclose(msle(y_true, y_pred), 0.480453)
 
     # Using 'none' reduction type.
     msle = elegy.losses.MeanSquaredLogarithmicError(
         reduction=elegy.losses.Reduction.NONE
     )
 
-    assert jnp.equal(msle(y_true, y_pred), jnp.array([0.24022643, 0.24022643])).all()
+    assert jnp.isclose(msle(y_true, y_pred), jnp.array([0.2402265, 0.2402265])).all()
 
 
 def test_function():
@@ -52,11 +53,82 @@ def test_function():
 
     assert loss.shape == (2,)
 
-    first_log = jnp.log(jnp.maximum(y_true, utils.EPSILON) + 1.0)
-    second_log = jnp.log(jnp.maximum(y_pred, utils.EPSILON) + 1.0)
+    first_log = jnp.log1p(jnp.maximum(y_true, 0.0))
+    second_log = jnp.log1p(jnp.maximum(y_pred, 0.0))
     assert jnp.array_equal(loss, jnp.mean(jnp.square(first_log - second_log), axis=-1))
 
 
+def test_no_clip():
+
+    rng = jax.random.PRNGKey(42)
+
+    y_true = jax.random.randint(rng, shape=(2, 3), minval=0, maxval=2)
+    y_pred = jax.random.uniform(rng, shape=(2, 3))
+
+    loss = elegy.losses.mean_squared_logarithmic_error(y_true, y_pred, clip=False)
+
+    assert jnp.allclose(
+        loss, elegy.losses.mean_squared_logarithmic_error(y_true, y_pred)
+    )
+
+    msle = elegy.losses.MeanSquaredLogarithmicError(clip=False)
+
+    assert jnp.isclose(
+        msle(y_true, y_pred), elegy.losses.MeanSquaredLogarithmicError()(y_true, y_pred)
+    )
+
+
+def test_clip():
+
+    y_true = jnp.array([[0.0, 1.0], [0.5, 0.0]])
+    y_pred = jnp.array([[-0.5, 1.0], [0.5, 0.2]])
+
+    clipped_loss = jnp.mean(
+        jnp.square(
+            jnp.log1p(jnp.maximum(y_true, 0.0)) - jnp.log1p(jnp.maximum(y_pred, 0.0))
+        ),
+        axis=-1,
+    )
+    unclipped_loss = jnp.mean(
+        jnp.square(jnp.log1p(y_true) - jnp.log1p(y_pred)), axis=-1
+    )
+
+    loss = elegy.losses.mean_squared_logarithmic_error(y_true, y_pred)
+
+    assert jnp.allclose(loss, clipped_loss)
+
+    loss = elegy.losses.mean_squared_logarithmic_error(y_true, y_pred, clip=False)
+
+    assert jnp.allclose(loss, unclipped_loss)
+    assert not jnp.allclose(loss, clipped_loss)
+
+    msle = elegy.losses.MeanSquaredLogarithmicError(
+        clip=False, reduction=elegy.losses.Reduction.NONE
+    )
+
+    assert jnp.allclose(msle(y_true, y_pred), unclipped_loss)
+
+
+def test_bfloat16():
+
+    rng = jax.random.PRNGKey(42)
+
+    y_true = jax.random.randint(rng, shape=(2, 3), minval=0, maxval=2)
+    y_pred = jax.random.uniform(rng, shape=(2, 3))
+
+    loss = elegy.losses.mean_squared_logarithmic_error(
+        y_true.astype(jnp.bfloat16), y_pred.astype(jnp.bfloat16)
+    )
+
+    assert loss.dtype == jnp.float32
+    assert jnp.allclose(
+        loss,
+        elegy.losses.mean_squared_logarithmic_error(y_true, y_pred),
+        rtol=0.01,
+        atol=0.01,
+    )
+
+
 def test_compatibility():
     # Input:  true (y_true) and predicted (y_pred) tensors
     y_true = jnp.array([[0.0, 1.0], [0.0, 0.0]])
@@ -8,6 +8,19 @@ import elegy
 
 
 class BinaryCrossentropyTest(TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        n_runs = 2
+
+        self.y_true = (rng.uniform(0, 1, size=(n_runs, 5, 6, 7)) > 0.5).astype(
+            np.float32
+        )
+        self.y_pred = rng.uniform(0, 1, size=(n_runs, 5, 6, 7))
+        self.sample_weight = rng.uniform(0, 1, size=(n_runs, 5, 6))
+
+        self.tm = tfk.metrics.BinaryAccuracy(threshold=0.3)
+        self.em = elegy.metrics.BinaryAccuracy(threshold=0.3)
+
     #
     def test_example(self):
         y_true = np.array([[1], [1], [0], [0]])
@@ -33,19 +46,16 @@ class BinaryCrossentropyTest(TestCase):
     #
     def test_compatibility(self):
 
-        y_true = (np.random.uniform(0, 1, size=(5, 6, 7)) > 0.5).astype(np.float32)
-        y_pred = np.random.uniform(0, 1, size=(5, 6, 7))
-        sample_weight = np.random.uniform(0, 1, size=(5, 6))
+        y_true = self.y_true[0]
+        y_pred = self.y_pred[0]
+        sample_weight = self.sample_weight[0]
 
         assert np.allclose(
             tfk.metrics.BinaryAccuracy()(y_true, y_pred),
             elegy.metrics.BinaryAccuracy()(y_true, y_pred),
         )
 
-        assert np.allclose(
-            tfk.metrics.BinaryAccuracy(threshold=0.3)(y_true, y_pred),
-            elegy.metrics.BinaryAccuracy(threshold=0.3)(y_true, y_pred),
-        )
+        assert np.allclose(self.tm(y_true, y_pred), self.em(y_true, y_pred))
 
         assert np.allclose(
             tfk.metrics.BinaryAccuracy(threshold=0.3)(
@@ -59,25 +69,15 @@ class BinaryCrossentropyTest(TestCase):
     #
     def test_cummulative(self):
 
-        tm = tfk.metrics.BinaryAccuracy(threshold=0.3)
-        em = elegy.metrics.BinaryAccuracy(threshold=0.3)
+        tm = self.tm
+        em = self.em
 
-        # 1st run
-        y_true = (np.random.uniform(0, 1, size=(5, 6, 7)) > 0.5).astype(np.float32)
-        y_pred = np.random.uniform(0, 1, size=(5, 6, 7))
-        sample_weight = np.random.uniform(0, 1, size=(5, 6))
+        for run in range(len(self.y_true)):
+            y_true = self.y_true[run]
+            y_pred = self.y_pred[run]
+            sample_weight = self.sample_weight[run]
 
-        assert np.allclose(
-            tm(y_true, y_pred, sample_weight=sample_weight),
-            em(y_true, y_pred, sample_weight=sample_weight),
-        )
-
-        # 2nd run
-        y_true = (np.random.uniform(0, 1, size=(5, 6, 7)) > 0.5).astype(np.float32)
-        y_pred = np.random.uniform(0, 1, size=(5, 6, 7))
-        sample_weight = np.random.uniform(0, 1, size=(5, 6))
-
-        assert np.allclose(
-            tm(y_true, y_pred, sample_weight=sample_weight),
-            em(y_true, y_pred, sample_weight=sample_weight),
-        )
+            assert np.allclose(
+                tm(y_true, y_pred, sample_weight=sample_weight),
+                em(y_true, y_pred, sample_weight=sample_weight),
+            )
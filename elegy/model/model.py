@@ -354,6 +354,11 @@ class Model(ModelBase):
         Raises:
             ValueError: In case of mismatch between the provided input data
                 and what the model expects.
+
+        Note:
+            On accelerators the parameter buffers of the model are donated to
+            the jitted train step, arrays previously obtained via `get_parameters`
+            must not be reused after calling this method, copy them if needed.
         """
         if x is None:
             x = {}
@@ -1,4 +1,5 @@
 from io import StringIO
+import sys
 import typing as tp
 
 import jax
@@ -42,7 +43,12 @@ class ModelBase(Module):
         super()._jit_functions()
         self.predict_fn_jit = elegy_jit(self.predict_fn, modules=self)
         self.test_fn_jit = elegy_jit(self.test_fn, modules=self)
-        self.train_fn_jit = elegy_jit(self.train_fn, modules=self)
+        # donated buffers are a no-op on CPU that only triggers warnings
+        self.train_fn_jit = elegy_jit(
+            self.train_fn,
+            modules=self,
+            donate_parameters=jax.devices()[0].platform != "cpu",
+        )
 
     def call(self, *args, **kwargs):
         return self.module(*args, **kwargs)
@@ -52,7 +58,10 @@ class ModelBase(Module):
             self.metrics.reset()
             self.initial_metrics_state = None
         elif self.initial_metrics_state is not None:
-            self.metrics.set_parameters(self.initial_metrics_state)
+            # copy so the initial state is not donated by `train_fn_jit`
+            self.metrics.set_parameters(
+                jax.tree_map(jnp.array, self.initial_metrics_state)
+            )
 
     def predict_fn(self, x: tp.Any = ()):
 
@@ -99,36 +108,48 @@ class ModelBase(Module):
         y: tp.Any = None,
         sample_weight: tp.Optional[np.ndarray] = None,
         class_weight: tp.Optional[np.ndarray] = None,
+        training: tp.Optional[bool] = None,
     ):
+        if training is None:
+            training = module.is_training()
+
         y_pred = self.predict_fn(x)
 
+        # fetched once and also returned so `test_fn` can reuse them for the metrics
+        parameters = self.module.get_parameters(trainable=True)
+        states = self.module.get_parameters(trainable=False)
+
         if self.loss is not None:
-            loss_logs = self.loss(
+            loss_logs, loss_values = self.loss(
                 x=x,
                 y_true=y,
                 y_pred=y_pred,
                 sample_weight=sample_weight,
                 class_weight=class_weight,
-                training=module.is_training(),
-                parameters=self.module.get_parameters(trainable=True),
-                states=self.module.get_parameters(trainable=False),
+                training=training,
+                parameters=parameters,
+                states=states,
             )
         else:
-            loss_logs = {}
+            loss_logs, loss_values = {}, jnp.zeros((0,))
 
-        hooks_losses_logs = module.get_losses()
+        hooks_losses_logs = module.get_losses() or {}
 
-        if hooks_losses_logs is None:
-            hooks_losses_logs = {}
+        # a single reduction over all losses instead of a chain of adds
+        loss = jnp.sum(loss_values, axis=0)
 
-        loss = sum(loss_logs.values()) + sum(hooks_losses_logs.values())
+        if hooks_losses_logs:
+            hooks_loss_values = jnp.stack(
+                jnp.broadcast_arrays(*hooks_losses_logs.values())
+            )
+            loss = loss + jnp.sum(hooks_loss_values, axis=0)
 
         total_loss_logs = {}
         total_loss_logs.update(hooks_losses_logs)
         total_loss_logs.update(loss_logs)
         total_loss_logs["loss"] = loss
 
-        return loss, y_pred, total_loss_logs
+        return loss, y_pred, total_loss_logs, parameters, states
 
     def test_fn(
         self,
@@ -139,14 +160,22 @@ class ModelBase(Module):
         get_gradients: bool = False,
     ) -> tp.Tuple[np.ndarray, tp.Dict, tp.Optional[tp.Dict]]:
 
+        training = module.is_training()
+
         if get_gradients:
-            (loss, y_pred, total_loss_logs), grads = module.value_and_grad(
-                self.loss_fn, modules=self.module
-            )(x, y, sample_weight, class_weight)
+            (
+                loss,
+                y_pred,
+                total_loss_logs,
+                parameters,
+                states,
+            ), grads = module.value_and_grad(self.loss_fn, modules=self.module)(
+                x, y, sample_weight, class_weight, training
+            )
         else:
             grads = None
-            loss, y_pred, total_loss_logs = self.loss_fn(
-                x, y, sample_weight, class_weight
+            loss, y_pred, total_loss_logs, parameters, states = self.loss_fn(
+                x, y, sample_weight, class_weight, training
             )
 
         logs = self.metrics(
@@ -156,9 +185,9 @@ class ModelBase(Module):
             y_pred=y_pred,
             sample_weight=sample_weight,
             class_weight=class_weight,
-            training=module.is_training(),
-            parameters=self.module.get_parameters(trainable=True),
-            states=self.module.get_parameters(trainable=False),
+            training=training,
+            parameters=parameters,
+            states=states,
         )
 
         return loss, logs, grads
@@ -327,6 +356,11 @@ class ModelBase(Module):
 
         Raises:
             ValueError: In case of invalid user-provided arguments.
+
+        Note:
+            On accelerators the parameter buffers of the model are donated to
+            the jitted train step, arrays previously obtained via `get_parameters`
+            must not be reused after calling this method, copy them if needed.
         """
         self.maybe_initialize(
             mode=Mode.train,
@@ -371,8 +405,8 @@ class ModelBase(Module):
                 )
                 self.metrics.initialized = True
 
-                self.initial_metrics_state = self.metrics.get_parameters(
-                    trainable=False
+                self.initial_metrics_state = jax.tree_map(
+                    jnp.array, self.metrics.get_parameters(trainable=False)
                 )
 
             if mode == Mode.test:
@@ -569,77 +603,100 @@ class Losses(Module):
         super().__init__(name="losses")
         self.losses = losses
 
+        # resolved once instead of on every trace, dedup happens in `call`
+        self._flat = []
+        for context, loss_fn in self._flatten((), losses):
+            loss_name = sys.intern(self.get_loss_name(context))
+            self._flat.append((context, loss_name, utils.inject_dependencies(loss_fn)))
+
     def call(self, **kwargs):
 
         logs = {}
 
-        for context, val in self.apply_recursive((), self.losses, **kwargs):
-            loss_name = self.get_unique_loss_name(context, logs)
-            logs[loss_name] = val
+        for context, loss_name, loss_fn in self._flat:
+            val = loss_fn(**kwargs)
 
-        return logs
+            if isinstance(val, dict):
+                for name, value in val.items():
+                    name = self.get_unique_loss_name(
+                        logs, self.get_loss_name(context + (name,))
+                    )
+                    logs[name] = value
+            else:
+                if loss_name in logs:
+                    loss_name = self.get_unique_loss_name(logs, loss_name)
+
+                logs[loss_name] = val
 
-    def apply_recursive(self, context: tp.Tuple[str, ...], losses, **kwargs):
+        # losses are also returned as a single stacked array so the total loss
+        # can be computed with one reduction, the logs keep the original values
+        if not logs:
+            return logs, jnp.zeros((0,))
 
-        if isinstance(losses, tp.Callable):
+        return logs, jnp.stack(jnp.broadcast_arrays(*logs.values()))
+
+    def _flatten(self, context: tp.Tuple[str, ...], losses):
+
+        if callable(losses):
             name = (
                 losses.name
                 if isinstance(losses, Loss)
                 else utils.lower_snake_case(losses.__name__)
             )
-            context += (name,)
-            val = utils.inject_dependencies(losses)(**kwargs)
-
-            if isinstance(val, tp.Dict):
-                for name, val in val.items():
-                    yield context + (name,), val
-            else:
-                yield context, val
+            yield context + (name,), losses
 
-        elif isinstance(losses, (tp.Tuple, tp.List)):
+        elif isinstance(losses, (tuple, list)):
             for loss in losses:
-                yield from self.apply_recursive(context, loss, **kwargs)
-        elif isinstance(losses, tp.Dict):
+                yield from self._flatten(context, loss)
+        elif isinstance(losses, dict):
             for name, loss in losses.items():
-                yield from self.apply_recursive(context + (name,), loss, **kwargs)
+                yield from self._flatten(context + (name,), loss)
         else:
             raise TypeError(f"Invalid type {type(losses)}")
 
-    def get_unique_loss_name(self, context, logs):
+    def get_loss_name(self, context):
         context = list(context)
 
         if not context[0].endswith("loss"):
             context[0] += "_loss"
 
-        name = "/".join(context)
+        return "/".join(context)
 
-        if name not in logs:
-            return name
-
-        i = 1
-        while f"{name}_{i}" in logs:
-            i += 1
-
-        return f"{name}_{i}"
+    def get_unique_loss_name(self, logs, name):
+        return module.get_unique_name(logs, name)
 
 
 class LossMetrics(Metric):
     def call(self, logs):
 
+        # all logs are accumulated in a single flat array so the update
+        # is one vectorized add instead of one add per log
+        leaves, treedef = jax.tree_flatten(logs)
+        shapes = [jnp.shape(leaf) for leaf in leaves]
+        sizes = [int(np.prod(shape)) for shape in shapes]
+        values = jnp.concatenate([jnp.ravel(leaf) for leaf in leaves])
+
+        # accumulate in at least float32, low precision totals (e.g. bfloat16) stall
+        dtype = jnp.promote_types(values.dtype, jnp.float32)
+        values = values.astype(dtype)
+
         count = self.add_parameter("count", initializer=jnp.zeros, trainable=False)
         total = self.add_parameter(
             "total",
-            initializer=lambda *args: jax.tree_map(lambda x: jnp.array(0.0), logs),
+            initializer=lambda *args: jnp.zeros(values.shape, dtype),
             trainable=False,
         )
 
         count += 1
-        total = jax.tree_multimap(lambda a, b: a + b, total, logs)
+        total = total + values
 
         self.update_parameter("count", count)
         self.update_parameter("total", total)
 
-        logs = jax.tree_map(lambda total: total / count, total)
+        splits = jnp.split(total / count, np.cumsum(sizes)[:-1].tolist())
+        logs = jax.tree_unflatten(
+            treedef, [split.reshape(shape) for split, shape in zip(splits, shapes)]
+        )
 
         return logs
 
@@ -649,53 +706,54 @@ class Metrics(Metric):
         super().__init__(**kwargs)
         self.metrics = metrics if metrics is not None else tuple()
 
+        self._flat = []
+        for context, metric_fn in self._flatten((), self.metrics):
+            metric_name = sys.intern("/".join(context))
+            self._flat.append(
+                (context, metric_name, utils.inject_dependencies(metric_fn))
+            )
+
     def call(self, logs, **kwargs):
 
         # Loss logs
         logs = LossMetrics()(logs)
 
         # Metric logs
-        for context, val in self.apply_recursive((), self.metrics, **kwargs):
-            name = "/".join(context)
-            name = self.get_unique_metric_name(logs, name)
-            logs[name] = val
+        for context, metric_name, metric_fn in self._flat:
+            val = metric_fn(**kwargs)
 
-        return logs
+            if isinstance(val, dict):
+                for name, value in val.items():
+                    name = self.get_unique_metric_name(
+                        logs, "/".join(context + (name,))
+                    )
+                    logs[name] = value
+            else:
+                if metric_name in logs:
+                    metric_name = self.get_unique_metric_name(logs, metric_name)
+
+                logs[metric_name] = val
 
-    def apply_recursive(self, context: tp.Tuple[str, ...], metrics, **kwargs):
+        return logs
 
-        if isinstance(metrics, tp.Callable):
+    def _flatten(self, context: tp.Tuple[str, ...], metrics):
 
+        if callable(metrics):
             name = (
                 metrics.name
                 if isinstance(metrics, module.Module)
                 else utils.lower_snake_case(metrics.__name__)
             )
-            context += (name,)
-            value = utils.inject_dependencies(metrics)(**kwargs)
-
-            if isinstance(value, tp.Dict):
-                for name, value in value.items():
-                    yield context + (name,), value
-            else:
-                yield context, value
-
-        elif isinstance(metrics, (tp.Tuple, tp.List)):
-            for loss in metrics:
-                yield from self.apply_recursive(context, loss, **kwargs)
-        elif isinstance(metrics, tp.Dict):
-            for name, loss in metrics.items():
-                yield from self.apply_recursive(context + (name,), loss, **kwargs)
+            yield context + (name,), metrics
+
+        elif isinstance(metrics, (tuple, list)):
+            for metric in metrics:
+                yield from self._flatten(context, metric)
+        elif isinstance(metrics, dict):
+            for name, metric in metrics.items():
+                yield from self._flatten(context + (name,), metric)
         else:
             raise TypeError(f"Invalid type {type(metrics)}")
 
     def get_unique_metric_name(self, logs, name):
-
-        if name not in logs:
-            return name
-
-        i = 1
-        while f"{name}_{i}" in logs:
-            i += 1
-
-        return f"{name}_{i}"
+        return module.get_unique_name(logs, name)
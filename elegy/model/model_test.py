@@ -1,4 +1,6 @@
 import unittest
+from types import SimpleNamespace
+from unittest import mock
 
 import elegy
 import jax
@@ -6,6 +8,8 @@ import jax.numpy as jnp
 import numpy as np
 import optax
 
+from elegy.model.model_base import LossMetrics, Losses, Metrics
+
 
 class MLP(elegy.Module):
     """Standard LeNet-300-100 MLP network."""
@@ -63,3 +67,84 @@ class ModelTest(unittest.TestCase):
         predict_acc = (model.predict(X).argmax(-1) == y).mean()
 
         assert eval_acc == predict_acc
+
+    def test_train_donate_reset_metrics(self):
+
+        # pretend to run on an accelerator so `train_fn_jit` donates parameters
+        with mock.patch.object(
+            jax, "devices", return_value=[SimpleNamespace(platform="gpu")]
+        ):
+            model = elegy.Model(
+                module=MLP(n1=3, n2=1),
+                loss=elegy.losses.SparseCategoricalCrossentropy(from_logits=True),
+                metrics=elegy.metrics.SparseCategoricalAccuracy(),
+                optimizer=optax.adamw(1e-3),
+            )
+
+        X = np.random.uniform(size=(5, 7, 7))
+        y = np.random.randint(10, size=(5,))
+
+        for _ in range(3):
+            logs = model.train_on_batch(X, y)
+            model.reset_metrics()
+
+        assert np.isfinite(logs["loss"])
+        assert logs["sparse_categorical_accuracy"] >= 0.0
+
+
+class LossesMetricsTest(unittest.TestCase):
+    def test_dict_output_names(self):
+        def f(y_true, y_pred):
+            return {"a": jnp.mean(y_pred)}
+
+        def g(y_true, y_pred):
+            return jnp.mean(y_true)
+
+        f.__name__ = "foo"
+        g.__name__ = "foo"
+
+        y_true = jnp.ones((4, 3))
+        y_pred = jnp.zeros((4, 3))
+
+        # names of dict outputs are resolved in order with the rest of the entries
+        logs, values = Losses([f, g])(y_true=y_true, y_pred=y_pred)
+
+        assert list(logs) == ["foo_loss/a", "foo_loss"]
+
+        logs = Metrics([f, g])({"loss": jnp.array(1.0)}, y_true=y_true, y_pred=y_pred)
+
+        assert list(logs) == ["loss", "foo/a", "foo"]
+
+    def test_losses_mixed_shapes(self):
+        y_true = jnp.array([[0.0, 1.0], [0.0, 0.0], [1.0, 1.0], [1.0, 0.0]])
+        y_pred = jnp.array([[1.0, 1.0], [1.0, 0.0], [1.0, 1.0], [0.0, 0.0]])
+
+        logs, values = Losses(
+            [
+                elegy.losses.MeanSquaredError(),
+                elegy.losses.MeanSquaredError(
+                    reduction=elegy.losses.Reduction.NONE, name="mse_none"
+                ),
+            ]
+        )(y_true=y_true, y_pred=y_pred)
+
+        # logs keep the shape returned by each loss
+        assert list(logs) == ["mean_squared_error_loss", "mse_none_loss"]
+        assert logs["mean_squared_error_loss"].shape == ()
+        assert logs["mse_none_loss"].shape == (4,)
+
+        # values are broadcasted and stacked only for the total loss reduction
+        assert values.shape == (2, 4)
+        assert jnp.allclose(values[0], logs["mean_squared_error_loss"])
+        assert jnp.allclose(values[1], logs["mse_none_loss"])
+
+    def test_loss_metrics_bfloat16(self):
+        loss_metrics = LossMetrics()
+
+        # a bfloat16 total would stop growing at 256
+        for _ in range(300):
+            logs = loss_metrics({"loss": jnp.array(1.0, jnp.bfloat16)})
+
+        assert loss_metrics.total.dtype == jnp.float32
+        assert jnp.allclose(loss_metrics.total, 300.0)
+        assert jnp.allclose(logs["loss"], 1.0)
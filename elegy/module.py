@@ -902,9 +902,11 @@ def set_context(static: "StaticContext", dynamic: "DynamicContext"):
 def jit(
     f: tp.Union[tp.Callable, Module],
     modules: tp.Optional[tp.Union[Module, tp.List[Module]]] = None,
+    donate_parameters: bool = False,
     **kwargs,
 ):
     static_argnums = tuple(kwargs.pop("static_argnums", ()))
+    donate_argnums = tuple(kwargs.pop("donate_argnums", ()))
 
     if modules is None:
         modules = []
@@ -922,6 +924,12 @@ def jit(
         raise ValueError("No module specified")
 
     static_argnums = (0, 1) + tuple(i + 4 for i in static_argnums)
+    donate_argnums = tuple(i + 4 for i in donate_argnums)
+
+    # the parameters of `modules` are always replaced by the outputs of `_jit_fn`
+    # so their input buffers can be reused by XLA if requested
+    if donate_parameters:
+        donate_argnums = (3,) + donate_argnums
 
     def _jit_fn(
         states_tuple: tp.Tuple[FrozenDict[str, tp.Any], ...],
@@ -951,7 +959,7 @@ def jit(
             parameters_tuple,
         )
 
-    jit_fn = jax.jit(_jit_fn, static_argnums, **kwargs)
+    jit_fn = jax.jit(_jit_fn, static_argnums, donate_argnums=donate_argnums, **kwargs)
 
     @functools.wraps(f)
     def wrapper(*args):
@@ -572,6 +572,42 @@ class TestTransforms(TestCase):
                 assert total_called == 6
                 assert m.n == 9
 
+    def test_jit_donate(self):
+        class SomeModule(elegy.Module):
+            n: jnp.ndarray
+
+            def call(self, x):
+                n = self.add_parameter("n", initializer=jnp.array(0))
+                self.update_parameter("n", n + 1)
+
+                return x + n
+
+        m = SomeModule()
+        m.init(jnp.zeros(3))
+
+        assert m.n == 0
+
+        def f(x):
+            return m(x)
+
+        # parameters of `modules` are donated and replaced by the outputs
+        f_jit = elegy.jit(f, modules=m, donate_parameters=True)
+
+        y = f_jit(jnp.ones(3))
+        assert jnp.allclose(y, 1.0)
+        assert m.n == 1
+
+        y = f_jit(jnp.ones(3))
+        assert jnp.allclose(y, 2.0)
+        assert m.n == 2
+
+        # user `donate_argnums` are relative to the arguments of `f`
+        f_jit = elegy.jit(f, modules=m, donate_parameters=True, donate_argnums=(0,))
+
+        y = f_jit(jnp.ones(3))
+        assert jnp.allclose(y, 3.0)
+        assert m.n == 3
+
 
 class TestOthers(TestCase):
     def test_trainable(self):